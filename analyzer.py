@@ -3,109 +3,201 @@
 Log Analyzer - Analyze historical API monitoring logs
 """
 
+import os
 import json
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
-from colorama import init, Fore, Style
+from collections import defaultdict, deque
+import sys
+from console import Fore, Style
+from typing import Dict, Optional
 
-init(autoreset=True)
+try:
+    # orjson is considerably faster at parsing and writing the log lines
+    from orjson import loads as json_loads, dumps as json_dumps
+except ImportError:
+    json_loads = json.loads
+    
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
 
 class LogAnalyzer:
     def __init__(self, logs_dir: str = "logs"):
         self.logs_dir = Path(logs_dir)
+        self._paths: Dict[str, tuple] = {}
+    
+    def _api_paths(self, api_name: str) -> tuple:
+        """Return (log file, stats file) for an API, computed once per name"""
+        paths = self._paths.get(api_name)
+        if paths is None:
+            slug = api_name.replace(' ', '_').lower()
+            paths = self._paths[api_name] = (
+                self.logs_dir / f"{slug}.log",
+                self.logs_dir / f"{slug}.stats.json"
+            )
+        return paths
+    
+    def log_path(self, api_name: str) -> Path:
+        """Path of the log file for an API"""
+        return self._api_paths(api_name)[0]
+    
+    def stats_path(self, api_name: str) -> Path:
+        """Path of the stats sidecar file for an API"""
+        return self._api_paths(api_name)[1]
+        
+    def iter_logs(self, api_name: str, stats: Optional[Dict] = None):
+        """Stream parsed log records for a specific API
         
-    def load_logs(self, api_name: str) -> list:
-        """Load logs for a specific API"""
-        log_file = self.logs_dir / f"{api_name.replace(' ', '_').lower()}.log"
+        When stats is given, reading resumes at stats['offset'] and the offset
+        is advanced past every complete line consumed.
+        """
+        log_file = self.log_path(api_name)
         
         if not log_file.exists():
-            return []
+            return
         
-        logs = []
-        with open(log_file, 'r') as f:
+        with open(log_file, 'rb', buffering=1 << 20) as f:
+            if stats is not None:
+                f.seek(stats['offset'])
             for line in f:
+                if stats is not None:
+                    if not line.endswith(b'\n'):
+                        break  # Partially written line, pick it up next time
+                    stats['offset'] += len(line)
                 try:
-                    logs.append(json.loads(line.strip()))
+                    yield json_loads(line)
                 except json.JSONDecodeError:
                     continue
-        
-        return logs
     
-    def calculate_uptime(self, logs: list) -> dict:
-        """Calculate uptime percentage"""
-        if not logs:
-            return {'uptime': 0, 'total_checks': 0, 'up_count': 0, 'down_count': 0}
-        
-        total = len(logs)
-        up_count = sum(1 for log in logs if log['status'] == 'up')
-        down_count = sum(1 for log in logs if log['status'] == 'down')
-        
-        uptime = (up_count / total) * 100 if total > 0 else 0
-        
+    def new_stats(self) -> Dict:
+        """Return empty running stats for an API"""
         return {
-            'uptime': round(uptime, 2),
-            'total_checks': total,
-            'up_count': up_count,
-            'down_count': down_count
+            'offset': 0,
+            'total_checks': 0,
+            'up_count': 0,
+            'down_count': 0,
+            'rt_sum': 0,
+            'rt_count': 0,
+            'incident_count': 0,
+            'recent_incidents': []
         }
     
-    def calculate_avg_response_time(self, logs: list) -> float:
-        """Calculate average response time"""
-        response_times = [log['response_time'] for log in logs if log.get('response_time')]
-        
-        if not response_times:
-            return 0
-        
-        return round(sum(response_times) / len(response_times), 2)
-    
-    def get_incidents(self, logs: list) -> list:
-        """Get list of downtime incidents"""
-        incidents = []
+    def aggregate(self, logs, stats: Optional[Dict] = None) -> Dict:
+        """Fold log records into running stats in a single pass"""
+        if stats is None:
+            stats = self.new_stats()
+        
+        total = stats['total_checks']
+        up_count = stats['up_count']
+        down_count = stats['down_count']
+        rt_sum = stats['rt_sum']
+        rt_count = stats['rt_count']
+        incident_count = stats['incident_count']
+        # Only the most recent incidents are shown
+        incidents = deque(stats['recent_incidents'], maxlen=5)
         
         for log in logs:
-            if log['status'] in ['down', 'error']:
+            total += 1
+            status = log['status']
+            if status == 'up':
+                up_count += 1
+            elif status in ('down', 'error'):
+                if status == 'down':
+                    down_count += 1
+                incident_count += 1
                 incidents.append({
                     'timestamp': log['timestamp'],
-                    'status': log['status'],
+                    'status': status,
                     'error': log.get('error', 'Unknown error')
                 })
+            
+            response_time = log.get('response_time')
+            if response_time:
+                rt_sum += response_time
+                rt_count += 1
         
-        return incidents
+        stats.update({
+            'total_checks': total,
+            'up_count': up_count,
+            'down_count': down_count,
+            'rt_sum': rt_sum,
+            'rt_count': rt_count,
+            'incident_count': incident_count,
+            'recent_incidents': list(incidents)
+        })
+        return stats
+    
+    def load_stats(self, api_name: str) -> Dict:
+        """Load stats from the sidecar file, scanning only newer log lines
+        
+        Falls back to a full scan if the sidecar is missing, unreadable or
+        refers to a log file that has since been truncated.
+        """
+        stats_file = self.stats_path(api_name)
+        log_file = self.log_path(api_name)
+        
+        stats = None
+        try:
+            with open(stats_file, 'rb') as f:
+                stats = json_loads(f.read())
+            if stats['offset'] > log_file.stat().st_size:
+                stats = None
+        except (OSError, ValueError, KeyError, TypeError):
+            stats = None
+        
+        if stats is None:
+            stats = self.new_stats()
+        
+        return self.aggregate(self.iter_logs(api_name, stats), stats)
+    
+    def save_stats(self, api_name: str, stats: Dict):
+        """Persist stats to the sidecar file"""
+        stats_file = self.stats_path(api_name)
+        tmp_file = stats_file.with_suffix('.tmp')
+        
+        # Write then rename so readers never see a half-written file
+        with open(tmp_file, 'wb') as f:
+            f.write(json_dumps(stats))
+        os.replace(tmp_file, stats_file)
     
     def analyze_api(self, api_name: str):
         """Analyze logs for a specific API"""
-        logs = self.load_logs(api_name)
+        stats = self.load_stats(api_name)
         
-        if not logs:
+        if not stats['total_checks']:
             print(f"{Fore.YELLOW}No logs found for {api_name}")
             return
         
-        uptime_stats = self.calculate_uptime(logs)
-        avg_response_time = self.calculate_avg_response_time(logs)
-        incidents = self.get_incidents(logs)
-        
-        print(f"\n{Fore.CYAN}{'='*60}")
-        print(f"{Fore.CYAN}Analysis for: {api_name}")
-        print(f"{Fore.CYAN}{'='*60}\n")
-        
-        print(f"{Fore.GREEN}📊 Uptime Statistics:")
-        print(f"   Uptime: {uptime_stats['uptime']}%")
-        print(f"   Total Checks: {uptime_stats['total_checks']}")
-        print(f"   Successful: {uptime_stats['up_count']}")
-        print(f"   Failed: {uptime_stats['down_count']}\n")
-        
-        print(f"{Fore.GREEN}⚡ Performance:")
-        print(f"   Average Response Time: {avg_response_time}ms\n")
-        
-        if incidents:
-            print(f"{Fore.RED}🚨 Recent Incidents ({len(incidents)}):")
-            for incident in incidents[-5:]:  # Show last 5 incidents
-                print(f"   [{incident['timestamp']}] {incident['status']}: {incident['error']}")
+        uptime = round((stats['up_count'] / stats['total_checks']) * 100, 2)
+        avg_response_time = (
+            round(stats['rt_sum'] / stats['rt_count'], 2) if stats['rt_count'] else 0
+        )
+        
+        # Build the report up front and emit it with a single write. Colored
+        # lines reset explicitly since autoreset only applies per write.
+        reset = Style.RESET_ALL
+        lines = [
+            f"\n{Fore.CYAN}{'='*60}{reset}",
+            f"{Fore.CYAN}Analysis for: {api_name}{reset}",
+            f"{Fore.CYAN}{'='*60}{reset}\n",
+            f"{Fore.GREEN}📊 Uptime Statistics:{reset}",
+            f"   Uptime: {uptime}%",
+            f"   Total Checks: {stats['total_checks']}",
+            f"   Successful: {stats['up_count']}",
+            f"   Failed: {stats['down_count']}\n",
+            f"{Fore.GREEN}⚡ Performance:{reset}",
+            f"   Average Response Time: {avg_response_time}ms\n"
+        ]
+        
+        if stats['incident_count']:
+            lines.append(f"{Fore.RED}🚨 Recent Incidents ({stats['incident_count']}):{reset}")
+            for incident in stats['recent_incidents']:
+                lines.append(f"   [{incident['timestamp']}] {incident['status']}: {incident['error']}")
         else:
-            print(f"{Fore.GREEN}✅ No incidents recorded!")
+            lines.append(f"{Fore.GREEN}✅ No incidents recorded!{reset}")
         
-        print(f"\n{Fore.CYAN}{'='*60}\n")
+        lines.append(f"\n{Fore.CYAN}{'='*60}{reset}\n\n")
+        sys.stdout.write('\n'.join(lines))
     
     def analyze_all(self):
         """Analyze all available logs"""
@@ -124,8 +216,6 @@ class LogAnalyzer:
             self.analyze_api(api_name)
 
 def main():
-    import sys
-    
     analyzer = LogAnalyzer()
     
     if len(sys.argv) > 1:
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Console colors - colorama when writing to a terminal, plain text otherwise
+"""
+
+import sys
+from colorama import init, Fore, Style
+
+class _NoColor:
+    """Stand-in for colorama's Fore/Style that yields empty codes"""
+    def __getattr__(self, name: str) -> str:
+        return ''
+
+if sys.stdout.isatty():
+    # Initialize colorama for cross-platform colored output
+    init(autoreset=True)
+else:
+    # Piped or redirected output gets no escape codes, so there is no need
+    # for colorama to wrap stdout and strip them on every write
+    Fore = Style = _NoColor()
@@ -7,7 +7,7 @@ Runs a few checks and shows the analysis
 import time
 from monitor import APIMonitor
 from analyzer import LogAnalyzer
-from colorama import Fore
+from console import Fore
 
 def main():
     print(f"{Fore.CYAN}{'='*60}")
@@ -25,6 +25,7 @@ def main():
         if i < 2:
             print(f"{Fore.CYAN}Waiting 5 seconds...\n")
             time.sleep(5)
+    monitor.close()
     
     # Show analysis
     print(f"\n{Fore.GREEN}Generating analysis report...\n")
@@ -3,17 +3,49 @@
 API Response Logger - Monitor APIs for downtime and changes
 """
 
+import os
 import json
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import hashlib
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from colorama import init, Fore, Style
-from typing import Dict, List, Optional
+from console import Fore, Style
+from typing import IO, Dict, List, Optional
+from analyzer import LogAnalyzer, json_dumps
 
-# Initialize colorama for cross-platform colored output
-init(autoreset=True)
+try:
+    # xxh3 is a fast non-cryptographic hash, good enough for change detection
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    # Optional backend that drives all checks from a single event loop,
+    # selected with "http_backend": "aiohttp" in the config
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Chunk size used when streaming response bodies into the hasher
+HASH_CHUNK_SIZE = 1 << 16
+
+# Unneeded bodies up to this size are drained to keep the connection alive;
+# larger ones are abandoned and their connection closed
+DRAIN_MAX_BYTES = 1 << 16
+
+# Alert message and level for each response time class from _classify
+RESPONSE_TIME_ALERTS = (
+    ("✅ {name} is healthy. Response time: {response_time}ms", 'info'),
+    ("⏱️  {name} is slow. Response time: {response_time}ms", 'warning'),
+    ("🐌 {name} is VERY SLOW! Response time: {response_time}ms", 'critical')
+)
+
+# Upper bound on concurrent checks; also used to size the connection pool
+MAX_WORKERS = 32
 
 class APIMonitor:
     def __init__(self, config_path: str = "config.json"):
@@ -21,6 +53,30 @@ class APIMonitor:
         self.logs_dir = Path("logs")
         self.logs_dir.mkdir(exist_ok=True)
         self.api_states = {}
+        # Shared session so connections are kept alive between checks
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Log files stay open between checks and are flushed once per run.
+        # Keyed by log path, since names differing only in case or spaces
+        # share a file
+        self._log_fps: Dict[Path, IO] = {}
+        self._log_names: Dict[Path, str] = {}
+        # The event loop and aiohttp session live as long as the monitor so
+        # connections are reused between runs
+        backend = self.config.get('http_backend', 'requests')
+        if backend not in ('requests', 'aiohttp'):
+            print(f"{Fore.RED}Error: Unknown http_backend '{backend}', expected 'requests' or 'aiohttp'")
+            exit(1)
+        if backend == 'aiohttp' and aiohttp is None:
+            print(f"{Fore.RED}Error: http_backend is 'aiohttp' but aiohttp is not installed")
+            exit(1)
+        self._loop = asyncio.new_event_loop() if backend == 'aiohttp' else None
+        self._aio_session = None
+        # Running stats per API, persisted next to the logs for fast analysis
+        self.analyzer = LogAnalyzer(self.logs_dir)
+        self._stats: Dict[Path, Dict] = {}
         
     def load_config(self, config_path: str) -> Dict:
         """Load configuration from JSON file"""
@@ -34,52 +90,92 @@ class APIMonitor:
             print(f"{Fore.RED}Error: Invalid JSON in {config_path}: {e}")
             exit(1)
     
-    def get_response_hash(self, response_data: str) -> str:
-        """Generate hash of response for change detection"""
-        return hashlib.md5(response_data.encode()).hexdigest()
-    
-    def check_api(self, api_config: Dict) -> Dict:
-        """Check a single API endpoint"""
-        name = api_config.get('name', 'Unknown API')
-        url = api_config['url']
-        method = api_config.get('method', 'GET').upper()
-        headers = api_config.get('headers', {})
-        expected_status = api_config.get('expected_status', 200)
-        
-        result = {
-            'name': name,
-            'url': url,
-            'timestamp': datetime.now().isoformat(),
+    def new_response_hasher(self):
+        """Create an incremental hasher for response change detection"""
+        if xxhash is not None:
+            return xxhash.xxh3_128()
+        return hashlib.blake2b(digest_size=16)
+    
+    def _new_result(self, api_config: Dict, timestamp: Optional[str]) -> Dict:
+        """Build an empty result record for an API check"""
+        return {
+            'name': api_config.get('name', 'Unknown API'),
+            'url': api_config['url'],
+            'timestamp': timestamp or datetime.now().isoformat(timespec='milliseconds'),
             'status': 'unknown',
             'response_time': None,
             'status_code': None,
             'error': None,
             'response_hash': None
         }
+    
+    def _record_response(self, result: Dict, api_config: Dict, status_code: int,
+                         start_time: float):
+        """Fill in response time and status for a completed request
+        
+        Called once the body has been handled. Hashed bodies and bodies of
+        up to DRAIN_MAX_BYTES are read in full, so response_time covers the
+        whole download; for a larger un-hashed body only the first
+        DRAIN_MAX_BYTES + 1 bytes are read before timing stops.
+        """
+        response_time = (time.time() - start_time) * 1000  # Convert to ms
+        
+        result['response_time'] = round(response_time, 2)
+        result['status_code'] = status_code
+        
+        # Check if API is up
+        if status_code == api_config.get('expected_status', 200):
+            result['status'] = 'up'
+        else:
+            result['status'] = 'error'
+            result['error'] = f"Unexpected status code: {status_code}"
+    
+    def _drain_body(self, response):
+        """Read and discard an unneeded body of up to DRAIN_MAX_BYTES
+        
+        A body that fits lets the connection go back to the pool. A larger
+        one is left unread and the connection is dropped with the response.
+        """
+        response.raw.read(DRAIN_MAX_BYTES + 1)
+    
+    async def _drain_body_async(self, response):
+        """Read and discard an unneeded body of up to DRAIN_MAX_BYTES"""
+        drained = 0
+        while drained <= DRAIN_MAX_BYTES:
+            chunk = await response.content.read(DRAIN_MAX_BYTES + 1 - drained)
+            if not chunk:
+                break
+            drained += len(chunk)
+    
+    def check_api(self, api_config: Dict, timestamp: Optional[str] = None) -> Dict:
+        """Check a single API endpoint
+        
+        run_checks passes one precomputed timestamp for the whole batch;
+        otherwise the current time is used.
+        """
+        result = self._new_result(api_config, timestamp)
         
         try:
             start_time = time.time()
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                timeout=10
-            )
-            response_time = (time.time() - start_time) * 1000  # Convert to ms
-            
-            result['response_time'] = round(response_time, 2)
-            result['status_code'] = response.status_code
-            
-            # Check if API is up
-            if response.status_code == expected_status:
-                result['status'] = 'up'
-            else:
-                result['status'] = 'error'
-                result['error'] = f"Unexpected status code: {response.status_code}"
-            
-            # Generate response hash for change detection
-            if api_config.get('check_response_structure', False):
-                result['response_hash'] = self.get_response_hash(response.text)
+            with self.session.request(
+                method=api_config.get('method', 'GET').upper(),
+                url=result['url'],
+                headers=api_config.get('headers', {}),
+                timeout=10,
+                stream=True
+            ) as response:
+                # Hash the body chunk by chunk rather than buffering it whole
+                if api_config.get('check_response_structure', False):
+                    hasher = self.new_response_hasher()
+                    for chunk in response.iter_content(HASH_CHUNK_SIZE):
+                        hasher.update(chunk)
+                    result['response_hash'] = hasher.hexdigest()
+                else:
+                    self._drain_body(response)
+                
+                # Timed once the body is handled: the full download, except for
+                # large un-hashed bodies where only the drained prefix is read
+                self._record_response(result, api_config, response.status_code, start_time)
                 
         except requests.exceptions.Timeout:
             result['status'] = 'down'
@@ -93,6 +189,57 @@ class APIMonitor:
         
         return result
     
+    async def check_api_async(self, session, api_config: Dict,
+                              timestamp: Optional[str] = None) -> Dict:
+        """Check a single API endpoint using an aiohttp session"""
+        result = self._new_result(api_config, timestamp)
+        
+        try:
+            start_time = time.time()
+            async with session.request(
+                api_config.get('method', 'GET').upper(),
+                result['url'],
+                headers=api_config.get('headers', {})
+            ) as response:
+                # Hash the body chunk by chunk rather than buffering it whole
+                if api_config.get('check_response_structure', False):
+                    hasher = self.new_response_hasher()
+                    async for chunk in response.content.iter_chunked(HASH_CHUNK_SIZE):
+                        hasher.update(chunk)
+                    result['response_hash'] = hasher.hexdigest()
+                else:
+                    await self._drain_body_async(response)
+                
+                # Timed once the body is handled, as in check_api
+                self._record_response(result, api_config, response.status, start_time)
+                    
+        except asyncio.TimeoutError:
+            result['status'] = 'down'
+            result['error'] = 'Request timeout'
+        except aiohttp.ClientConnectionError:
+            result['status'] = 'down'
+            result['error'] = 'Connection error'
+        except Exception as e:
+            result['status'] = 'error'
+            result['error'] = str(e)
+        
+        return result
+    
+    async def _run_async(self, apis: List[Dict], timestamp: str) -> List[Dict]:
+        """Run all checks concurrently on the event loop"""
+        if self._aio_session is None:
+            # Created lazily so it is bound to the monitor's event loop
+            self._aio_session = aiohttp.ClientSession(
+                # Connect and per-read limits, matching timeout=10 in requests
+                timeout=aiohttp.ClientTimeout(sock_connect=10, sock_read=10),
+                connector=aiohttp.TCPConnector(limit=MAX_WORKERS),
+                # Honour proxy environment variables like requests does
+                trust_env=True
+            )
+        return await asyncio.gather(
+            *(self.check_api_async(self._aio_session, api, timestamp) for api in apis)
+        )
+    
     def detect_changes(self, api_name: str, current_hash: Optional[str]) -> bool:
         """Detect if API response structure has changed"""
         if current_hash is None:
@@ -112,10 +259,48 @@ class APIMonitor:
 
     def log_result(self, result: Dict):
         """Log result to file"""
-        log_file = self.logs_dir / f"{result['name'].replace(' ', '_').lower()}.log"
+        name = result['name']
+        log_file = self.analyzer.log_path(name)
+        fp = self._log_fps.get(log_file)
+        if fp is None:
+            # Pick up stats for any history already on disk before appending
+            stats = self._stats[log_file] = self.analyzer.load_stats(name)
+            # load_stats stops before a half-written last line (e.g. after a
+            # crash); drop it so the next record is not appended onto it
+            if log_file.exists() and log_file.stat().st_size > stats['offset']:
+                os.truncate(log_file, stats['offset'])
+            fp = self._log_fps[log_file] = open(log_file, 'ab', buffering=1 << 16)
+            self._log_names[log_file] = name
         
-        with open(log_file, 'a') as f:
-            f.write(json.dumps(result) + '\n')
+        fp.write(json_dumps(result))
+        fp.write(b'\n')
+        
+        stats = self.analyzer.aggregate((result,), self._stats[log_file])
+        stats['offset'] = fp.tell()
+    
+    def flush_logs(self):
+        """Flush buffered log writes to disk and persist stats"""
+        for log_file, fp in self._log_fps.items():
+            fp.flush()
+            self.analyzer.save_stats(self._log_names[log_file], self._stats[log_file])
+    
+    def close_logs(self):
+        """Close all open log files"""
+        self.flush_logs()
+        for fp in self._log_fps.values():
+            fp.close()
+        self._log_fps.clear()
+        self._log_names.clear()
+    
+    def close(self):
+        """Release log files and network resources"""
+        self.close_logs()
+        if self._loop is not None and not self._loop.is_closed():
+            if self._aio_session is not None:
+                self._loop.run_until_complete(self._aio_session.close())
+                self._aio_session = None
+            self._loop.close()
+        self.session.close()
     
     def alert(self, message: str, level: str = 'info'):
         """Send alerts based on configuration"""
@@ -133,7 +318,7 @@ class APIMonitor:
             print(f"{color}[{timestamp}] {message}{Style.RESET_ALL}")
         
         # Webhook alert
-        if alert_settings.get('webhook', False) and level in ['warning', 'critical']:
+        if alert_settings.get('webhook', False) and level in ('warning', 'critical'):
             webhook_url = alert_settings.get('webhook_url')
             if webhook_url:
                 try:
@@ -141,6 +326,11 @@ class APIMonitor:
                 except:
                     pass  # Silently fail webhook alerts
     
+    def _classify(self, response_time: float, warning: float, critical: float) -> int:
+        """Classify a response time as 0 (healthy), 1 (slow) or 2 (very slow)"""
+        # Summing the two comparisons gives the level without an if/elif chain
+        return (response_time > warning) + (response_time > critical)
+    
     def analyze_result(self, result: Dict):
         """Analyze result and send appropriate alerts"""
         name = result['name']
@@ -156,24 +346,13 @@ class APIMonitor:
         elif status == 'up':
             # Check response time
             if response_time:
-                critical_threshold = thresholds.get('response_time_critical', 5000)
-                warning_threshold = thresholds.get('response_time_warning', 2000)
-                
-                if response_time > critical_threshold:
-                    self.alert(
-                        f"🐌 {name} is VERY SLOW! Response time: {response_time}ms",
-                        'critical'
-                    )
-                elif response_time > warning_threshold:
-                    self.alert(
-                        f"⏱️  {name} is slow. Response time: {response_time}ms",
-                        'warning'
-                    )
-                else:
-                    self.alert(
-                        f"✅ {name} is healthy. Response time: {response_time}ms",
-                        'info'
-                    )
+                level = self._classify(
+                    response_time,
+                    thresholds.get('response_time_warning', 2000),
+                    thresholds.get('response_time_critical', 5000)
+                )
+                message, alert_level = RESPONSE_TIME_ALERTS[level]
+                self.alert(message.format(name=name, response_time=response_time), alert_level)
             
             # Check for response structure changes
             response_hash = result.get('response_hash')
@@ -192,13 +371,23 @@ class APIMonitor:
             return
         
         print(f"\n{Fore.CYAN}{'='*60}")
-        print(f"{Fore.CYAN}Starting API checks at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        now = datetime.now()
+        print(f"{Fore.CYAN}Starting API checks at {now.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{Fore.CYAN}{'='*60}\n")
         
-        for api_config in apis:
-            result = self.check_api(api_config)
+        # Checks are I/O bound, so run them concurrently. Logging and alerting
+        # stay on the main thread to keep api_states and log writes serialized.
+        timestamp = now.isoformat(timespec='milliseconds')
+        if self._loop is not None:
+            results = self._loop.run_until_complete(self._run_async(apis, timestamp))
+        else:
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(apis))) as executor:
+                results = list(executor.map(lambda api: self.check_api(api, timestamp), apis))
+        
+        for result in results:
             self.log_result(result)
             self.analyze_result(result)
+        self.flush_logs()
         
         print(f"\n{Fore.CYAN}{'='*60}\n")
     
@@ -217,6 +406,8 @@ class APIMonitor:
                 time.sleep(check_interval)
         except KeyboardInterrupt:
             print(f"\n{Fore.YELLOW}Monitor stopped by user.")
+        finally:
+            self.close()
 
 def main():
     monitor = APIMonitor()
@@ -0,0 +1,67 @@
+import os
+import json
+import tempfile
+import unittest
+
+from monitor import APIMonitor
+
+
+class LogResultTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        with open("config.json", 'w') as f:
+            json.dump({'apis': []}, f)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _result(self, name: str, status: str = 'up') -> dict:
+        return {
+            'name': name,
+            'url': 'http://example.invalid/',
+            'timestamp': '2026-01-01T00:00:00.000',
+            'status': status,
+            'response_time': 12.5,
+            'status_code': 200,
+            'error': None,
+            'response_hash': None
+        }
+
+    def _run(self, *names: str) -> APIMonitor:
+        monitor = APIMonitor()
+        for name in names:
+            monitor.log_result(self._result(name))
+        monitor.close()
+        return monitor
+
+    def test_partial_last_line_is_dropped_before_appending(self):
+        monitor = self._run("Small", "Small")
+        log_file = monitor.analyzer.log_path("Small")
+        with open(log_file, 'ab') as f:
+            f.write(b'{"name":"Small","sta')
+
+        monitor = self._run("Small", "Small")
+
+        sidecar = monitor.analyzer.load_stats("Small")
+        os.remove(monitor.analyzer.stats_path("Small"))
+        full_scan = monitor.analyzer.load_stats("Small")
+        self.assertEqual(sidecar['total_checks'], 4)
+        self.assertEqual(full_scan, sidecar)
+        self.assertTrue(log_file.read_bytes().endswith(b'\n'))
+
+    def test_names_sharing_a_log_file_share_stats(self):
+        monitor = self._run("Small API", "small_api", "Small API")
+        log_file = monitor.analyzer.log_path("Small API")
+
+        with open(monitor.analyzer.stats_path("Small API")) as f:
+            sidecar = json.load(f)
+        self.assertEqual(sidecar['total_checks'], 3)
+        self.assertEqual(sidecar['offset'], log_file.stat().st_size)
+
+
+
+if __name__ == "__main__":
+    unittest.main()